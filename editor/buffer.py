@@ -9,6 +9,29 @@ from editor.cursor import Cursor
 logger = logging.getLogger(__name__)
 
 
+def _common_prefix(a: list, b: list) -> int:
+    """Length of the shared identical prefix; slice compares run in C."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: list, b: list, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:len(a) - lo] == b[len(b) - mid:len(b) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
 class TextBuffer:
     """
     Text model + undo/redo + persistent rope snapshots + rebalance control.
@@ -21,6 +44,8 @@ class TextBuffer:
         self.undo_stack: List[Tuple[List, int, int]] = []
         self.redo_stack: List[Tuple[List, int, int]] = []
         self.edit_counter = 0  # incremental diff-based performance trigger
+        self.disk_roots = [line.root for line in self.text]  # roots as last loaded/saved
+        self.dirty = None  # (start, old_end, new_end) rows changed since take_dirty()
 
     # ---------------- state (undo/redo) -----------------
     def save_state(self) -> None:
@@ -29,9 +54,28 @@ class TextBuffer:
         self.redo_stack.clear()
         logger.debug("State saved. Undo depth=%d", len(self.undo_stack))
 
+    def mark_dirty(self, row: int, old_count: int, new_count: int) -> None:
+        """Record that old_count lines at row were replaced by new_count lines."""
+        if self.dirty is None:
+            self.dirty = (row, row + old_count, row + new_count)
+            return
+        start, old_end, new_end = self.dirty
+        end = max(new_end, row + old_count)
+        self.dirty = (min(start, row), end - new_end + old_end, end + new_count - old_count)
+
+    def take_dirty(self):
+        """Return and clear the changed row span (None if nothing changed)."""
+        dirty, self.dirty = self.dirty, None
+        return dirty
+
     def restore_state(self, snapshot) -> None:
         nodes, r, c = snapshot
+        old = [t.root for t in self.text]
         self.text = [Rope(node) for node in nodes]
+        start = _common_prefix(old, nodes)
+        tail = _common_suffix(old, nodes, min(len(old), len(nodes)) - start)
+        if start + tail < max(len(old), len(nodes)):
+            self.mark_dirty(start, len(old) - start - tail, len(nodes) - start - tail)
         self.cursor.set_position(r, c)
         logger.debug("State restored: row=%d col=%d lines=%d", r, c, len(self.text))
 
@@ -56,11 +100,19 @@ class TextBuffer:
         self.edit_counter += 1
         if self.edit_counter >= REBALANCE_THRESHOLD:
             logger.info("Rebalancing all lines (edit_counter=%d)", self.edit_counter)
+            first = last = None
             for i in range(len(self.text)):
                 try:
-                    self.text[i] = self.text[i].rebalance()
+                    balanced = self.text[i].rebalance()
                 except Exception:
                     logger.exception("Rebalance failed on line %d", i)
+                    continue
+                if balanced.root is not self.text[i].root:
+                    first = i if first is None else first
+                    last = i
+                self.text[i] = balanced
+            if first is not None:
+                self.mark_dirty(first, last - first + 1, last - first + 1)
             self.edit_counter = 0
 
     # ---------------- cursor bounds -----------------
@@ -84,6 +136,7 @@ class TextBuffer:
     def insert_char(self, ch: str) -> None:
         r, c = self.cursor.row, self.cursor.col
         self.text[r] = self.text[r].insert(c, ch)
+        self.mark_dirty(r, 1, 1)
         self.cursor.col += 1
         self.cursor.preferred_col = self.cursor.col
         logger.debug("Inserted '%s' at row=%d col=%d", ch, r, c)
@@ -97,11 +150,13 @@ class TextBuffer:
             prev_len = len(self.text[r - 1].get_text())
             self.text[r - 1] = self.text[r - 1].concat(self.text[r])
             del self.text[r]
+            self.mark_dirty(r - 1, 2, 1)
             self.cursor.row -= 1
             self.cursor.col = prev_len
             logger.debug("Merged line up at row=%d -> row=%d", r, self.cursor.row)
         elif c > 0:  # delete
             self.text[r] = self.text[r].delete(c - 1, c)
+            self.mark_dirty(r, 1, 1)
             self.cursor.col -= 1
             logger.debug("Deleted char at row=%d col=%d", r, c - 1)
 
@@ -113,6 +168,7 @@ class TextBuffer:
         left, right = self.text[r].split(c)
         self.text[r] = left
         self.text.insert(r + 1, right)
+        self.mark_dirty(r, 1, 2)
         self.cursor.row += 1
         self.cursor.col = 0
         logger.debug("Split line at row=%d col=%d", r, c)
@@ -168,9 +224,16 @@ class TextBuffer:
         self.undo_stack.clear()
         self.redo_stack.clear()
         self.edit_counter = 0
+        self.dirty = None
+        self.mark_saved()
         logger.info("Loaded %s (%d lines)", path, len(self.text))
 
+    def mark_saved(self) -> None:
+        """Current text now matches the file on disk (diff base for DiffTracker)."""
+        self.disk_roots = [line.root for line in self.text]
+
     def save_file(self, path: str, encoding: str = "utf-8") -> None:
         with open(path, "w", encoding=encoding) as f:
             f.write("\n".join(line.get_text() for line in self.text))
+        self.mark_saved()
         logger.info("Saved file %s", path)
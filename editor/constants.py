@@ -1,2 +1,6 @@
 REBALANCE_THRESHOLD = 200
-SCROLL_MARGIN = 2
\ No newline at end of file
+SCROLL_MARGIN = 2
+DIFF_MAX_EDIT_DISTANCE = 256
+DIFF_CHUNK_LINES = 64
+GUTTER_WIDTH = 2
+DIFF_PANEL_WIDTH = 28
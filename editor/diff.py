@@ -0,0 +1,267 @@
+# editor/diff.py
+import logging
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from editor.constants import DIFF_MAX_EDIT_DISTANCE, DIFF_CHUNK_LINES
+from editor.rope_tree import Rope
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Hunk:
+    """A changed region: base lines [base_start, +base_count) became current lines [cur_start, +cur_count)."""
+    base_start: int
+    base_count: int
+    cur_start: int
+    cur_count: int
+
+    @property
+    def kind(self) -> str:
+        if self.base_count == 0:
+            return "+"
+        if self.cur_count == 0:
+            return "-"
+        return "~"
+
+    @property
+    def base_end(self) -> int:
+        return self.base_start + self.base_count
+
+    @property
+    def cur_end(self) -> int:
+        return self.cur_start + self.cur_count
+
+    def shifted(self, base_off: int, cur_off: int) -> "Hunk":
+        return Hunk(self.base_start + base_off, self.base_count,
+                    self.cur_start + cur_off, self.cur_count)
+
+
+# ---------------- line diff (Myers) -----------------
+def myers_hunks(a: List[str], b: List[str], max_d: int = DIFF_MAX_EDIT_DISTANCE) -> List[Hunk]:
+    """
+    Myers O(ND) line diff of a -> b, returned as hunks.
+    Common prefix/suffix are trimmed first; if the edit distance exceeds max_d
+    (checked up front with a cheap lower bound, then during the search)
+    the remaining middle is reported as one replaced block.
+    """
+    lo = 0
+    while lo < len(a) and lo < len(b) and a[lo] == b[lo]:
+        lo += 1
+    hi_a, hi_b = len(a), len(b)
+    while hi_a > lo and hi_b > lo and a[hi_a - 1] == b[hi_b - 1]:
+        hi_a -= 1
+        hi_b -= 1
+
+    a_mid, b_mid = a[lo:hi_a], b[lo:hi_b]
+    if not a_mid and not b_mid:
+        return []
+    if not a_mid or not b_mid or _min_distance(a_mid, b_mid) > max_d:
+        return [Hunk(lo, len(a_mid), lo, len(b_mid))]
+
+    matches = _myers_matches(a_mid, b_mid, max_d)
+    if matches is None:
+        return [Hunk(lo, len(a_mid), lo, len(b_mid))]
+
+    hunks = []
+    x = y = 0
+    for mx, my in matches + [(len(a_mid), len(b_mid))]:
+        if mx > x or my > y:
+            hunks.append(Hunk(lo + x, mx - x, lo + y, my - y))
+        x, y = mx + 1, my + 1
+    return hunks
+
+
+def _min_distance(a, b) -> int:
+    """Lower bound on the edit distance: lines with no counterpart on the other side."""
+    common = sum((Counter(a) & Counter(b)).values())
+    return len(a) + len(b) - 2 * common
+
+
+def _myers_matches(a, b, max_d) -> Optional[List[Tuple[int, int]]]:
+    """Return matched (i, j) pairs in order, or None if distance > max_d."""
+    n, m = len(a), len(b)
+    limit = min(n + m, max_d)
+    offset = limit + 1
+    v = [0] * (2 * limit + 3)
+    trace = []
+
+    for d in range(limit + 1):
+        # backtracking only reads diagonals -d..d of the previous round
+        trace.append(v[offset - d:offset + d + 1])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace, x, y) -> List[Tuple[int, int]]:
+    matches = []
+    for d in range(len(trace) - 1, 0, -1):
+        v = trace[d]  # v[k + d] is diagonal k
+        k = x - y
+        if k == -d or (k != d and v[k - 1 + d] < v[k + 1 + d]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k + d]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            matches.append((x, y))
+        x, y = prev_x, prev_y
+    while x > 0 and y > 0:  # initial snake from (0, 0)
+        x -= 1
+        y -= 1
+        matches.append((x, y))
+    matches.reverse()
+    return matches
+
+
+def chunked(hunks: List[Hunk], size: int = DIFF_CHUNK_LINES) -> List[Hunk]:
+    """Split hunks so neither side spans more than size lines."""
+    out = []
+    for h in hunks:
+        if h.base_count <= size and h.cur_count <= size:
+            out.append(h)
+            continue
+        for i in range(0, max(h.base_count, h.cur_count), size):
+            out.append(Hunk(h.base_start + min(i, h.base_count), min(size, max(0, h.base_count - i)),
+                            h.cur_start + min(i, h.cur_count), min(size, max(0, h.cur_count - i))))
+    return out
+
+
+# ---------------- buffer vs disk -----------------
+class DiffTracker:
+    """
+    Changes of the TextBuffer relative to the last loaded/saved version.
+    Lines whose rope root is the very node read from disk are unchanged by
+    construction (persistent ropes share untouched nodes), so they act as
+    anchors; only the gaps between anchors get a real Myers diff.
+    After the initial pass, update() only re-diffs the rows the buffer
+    reports as dirty plus the hunks touching them; later hunks are shifted.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.panel_visible = False
+        self.hunks: List[Hunk] = []
+        self._starts: List[int] = []  # cur_start of each hunk, for bisect
+        self._panel: Optional[List[str]] = None
+        self._base = None
+        self._base_index: Dict[int, int] = {}
+
+    def toggle_panel(self) -> None:
+        self.panel_visible = not self.panel_visible
+
+    def update(self) -> None:
+        buf = self.buffer
+        if buf.disk_roots is not self._base:
+            self._base = buf.disk_roots
+            self._base_index = {id(node): i for i, node in enumerate(self._base)}
+            buf.take_dirty()
+            self._set_hunks(self._diff_region(0, len(self._base), 0, len(buf.text)))
+            return
+
+        dirty = buf.take_dirty()
+        if dirty is None:
+            return
+        start, old_end, new_end = dirty
+
+        # hunks overlapping or touching the dirty rows (old coordinates)
+        hunks = self.hunks
+        i = bisect_left(self._starts, start)
+        while i > 0 and hunks[i - 1].cur_end >= start:
+            i -= 1
+        j = i
+        while j < len(hunks) and hunks[j].cur_start <= old_end:
+            j += 1
+
+        lo = min(start, hunks[i].cur_start) if i < j else start
+        hi = max(old_end, hunks[j - 1].cur_end) if i < j else old_end
+        delta = new_end - old_end
+        region = self._diff_region(lo - self._offset_before(i), hi - self._offset_before(j),
+                                   lo, hi + delta)
+        tail = [h.shifted(0, delta) for h in hunks[j:]] if delta else hunks[j:]
+        self._set_hunks(hunks[:i] + region + tail)
+
+    def _offset_before(self, index: int) -> int:
+        """cur - base line offset in the unchanged rows preceding hunks[index]."""
+        if index == 0:
+            return 0
+        h = self.hunks[index - 1]
+        return h.cur_end - h.base_end
+
+    def _set_hunks(self, hunks: List[Hunk]) -> None:
+        self.hunks = hunks
+        self._starts = [h.cur_start for h in hunks]
+        self._panel = None
+        logger.debug("Diff updated: %d hunks", len(hunks))
+
+    def _diff_region(self, b0, b1, c0, c1) -> List[Hunk]:
+        """Diff base rows [b0, b1) against current rows [c0, c1)."""
+        current = [line.root for line in self.buffer.text[c0:c1]]
+        hunks: List[Hunk] = []
+
+        prev_b, prev_c = b0 - 1, -1
+        for c, node in enumerate(current + [None]):
+            if node is None:
+                b = b1
+            else:
+                b = self._base_index.get(id(node), -1)
+                if b <= prev_b or b >= b1:
+                    continue
+            if b - prev_b > 1 or c - prev_c > 1:
+                base_lines = [Rope(n).get_text() for n in self._base[prev_b + 1:b]]
+                cur_lines = [Rope(n).get_text() for n in current[prev_c + 1:c]]
+                hunks.extend(h.shifted(prev_b + 1, c0 + prev_c + 1)
+                             for h in myers_hunks(base_lines, cur_lines))
+            prev_b, prev_c = b, c
+        return chunked(hunks)
+
+    def marks(self, top: int, bottom: int) -> Dict[int, str]:
+        """Gutter marks for current rows [top, bottom)."""
+        line_count = len(self.buffer.text)
+        hunks = self.hunks
+        i = bisect_left(self._starts, top)
+        if i > 0 and hunks[i - 1].cur_end > top:
+            i -= 1
+        out = {}
+        while i < len(hunks) and hunks[i].cur_start < bottom:
+            h = hunks[i]
+            if h.cur_count == 0:
+                out.setdefault(min(h.cur_start, line_count - 1), "-")
+            else:
+                for row in range(max(top, h.cur_start), min(bottom, h.cur_end)):
+                    out[row] = h.kind
+            i += 1
+        return out
+
+    def panel_lines(self) -> List[str]:
+        if self._panel is not None:
+            return self._panel
+        merged: List[Hunk] = []
+        for h in self.hunks:  # rejoin chunked pieces of one change
+            last = merged[-1] if merged else None
+            if last and last.cur_end == h.cur_start and last.base_end == h.base_start:
+                merged[-1] = Hunk(last.base_start, last.base_count + h.base_count,
+                                  last.cur_start, last.cur_count + h.cur_count)
+            else:
+                merged.append(h)
+        self._panel = [f"Changes ({len(merged)})"]
+        for h in merged:
+            self._panel.append(f"{h.kind} L{h.cur_start + 1}  -{h.base_count} +{h.cur_count}")
+        return self._panel
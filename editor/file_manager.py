@@ -5,6 +5,7 @@ class FileManager:
     def __init__(self, buffer):
         self.buffer = buffer
         self.current_file = None
+        self.recorder = None  # SessionRecorder, if recording
 
     def prompt(self, stdscr, message):
         curses.echo()
@@ -18,12 +19,23 @@ class FileManager:
     def save(self, stdscr):
         if not self.current_file:
             self.current_file = self.prompt(stdscr, "Save as: ")
+            if self.current_file and self.recorder:
+                self.recorder.file_save_as(self.current_file)
 
         if self.current_file:
-            self.buffer.save_file(self.current_file)
+            self.write(self.current_file)
 
     def open(self, stdscr):
         path = self.prompt(stdscr, "Open file: ")
         if path:
             self.current_file = path
-            self.buffer.load_file(path)
+            self.load(path)
+            if self.recorder:
+                self.recorder.file_open(path)
+
+    # disk access, kept separate so session replay can swap it out
+    def write(self, path):
+        self.buffer.save_file(path)
+
+    def load(self, path):
+        self.buffer.load_file(path)
@@ -7,6 +7,7 @@ from editor.file_manager import FileManager
 CTRL_S = 19   # CTRL+S
 CTRL_O = 15   # CTRL+O
 CTRL_Q = 17   # CTRL+Q
+CTRL_D = 4    # CTRL+D
 
 
 
@@ -19,6 +20,7 @@ class InputHandler:
     def __init__(self, buffer):
         self.buffer = buffer
         self.file_manager = None 
+        self.diff_tracker = None
     def handle_key(self, key, stdscr=None):
         # ===== Exit =====
         if key == 27:  # ESC
@@ -44,6 +46,12 @@ class InputHandler:
                 self.file_manager.open(stdscr)
             return True
 
+        # ===== Changes panel =====
+        if key == CTRL_D:
+            if self.diff_tracker:
+                self.diff_tracker.toggle_panel()
+            return True
+
         if key in (CTRL_Q, 3):  # Ctrl+Q OR Ctrl+C
             raise KeyboardInterrupt
 
@@ -1,23 +1,49 @@
 # editor/render.py
 import curses
 
+from editor.constants import GUTTER_WIDTH, DIFF_PANEL_WIDTH
+
 class Renderer:
     """
     Renders only the visible viewport of the TextBuffer using cursor.scroll_x/scroll_y
     and keeps a screen cache of lines to perform incremental updates.
+    With a DiffTracker attached, a change gutter is drawn left of the text and
+    an optional changes panel on the right.
     """
 
-    def __init__(self, stdscr, buffer):
+    def __init__(self, stdscr, buffer, diff=None):
         self.stdscr = stdscr
         self.buffer = buffer
+        self.diff = diff
         self.screen_cache = []
+        self.layout = None
+        self.text_x = 0
 
         # initialize viewport sizes from terminal
-        h, w = stdscr.getmaxyx()
+        self.apply_layout()
+
+    def apply_layout(self):
+        """Recompute viewport from terminal size, gutter and panel; reset cache on change."""
+        h, w = self.stdscr.getmaxyx()
+        gutter = GUTTER_WIDTH if self.diff else 0
+        panel = DIFF_PANEL_WIDTH if self.diff and self.diff.panel_visible else 0
+        layout = (h, w, gutter, panel)
+        if layout == self.layout:
+            return
+
+        if self.layout is not None:
+            self.stdscr.erase()
+        self.layout = layout
+        self.screen_cache = []
+        self.text_x = gutter
         self.buffer.cursor.viewport_rows = max(1, h - 1)  # reserve maybe 1 row for status
-        self.buffer.cursor.viewport_cols = max(10, w - 1)
+        self.buffer.cursor.viewport_cols = max(10, w - 1 - gutter - panel)
 
     def render(self):
+        self.apply_layout()
+        if self.diff:
+            self.diff.update()
+
         # ensure cursor visible inside buffer
         self.buffer.cursor.ensure_visible()
 
@@ -27,6 +53,7 @@ class Renderer:
         cols = self.buffer.cursor.viewport_cols
 
         text = self.buffer.text
+        marks = self.diff.marks(top, top + rows) if self.diff else {}
 
         # ensure cache length
         if len(self.screen_cache) < len(text):
@@ -38,6 +65,8 @@ class Renderer:
             full_line = rope.get_text()
             # take viewport slice horizontally
             visible = full_line[left:left + cols]
+            if self.text_x:
+                visible = marks.get(line_index, " ").ljust(self.text_x) + visible
 
             cache_index = line_index - top
             if cache_index >= len(self.screen_cache):
@@ -66,11 +95,29 @@ class Renderer:
             except curses.error:
                 pass
 
+        if self.diff and self.diff.panel_visible:
+            self.render_panel(rows, w)
+
         # Move cursor to (cursor.row - top, cursor.col - left)
         try:
-            self.stdscr.move(self.buffer.cursor.row - top, self.buffer.cursor.col - left)
+            self.stdscr.move(self.buffer.cursor.row - top,
+                             self.buffer.cursor.col - left + self.text_x)
         except curses.error:
             # out of viewport or tiny terminal; ignore
             pass
 
         self.stdscr.refresh()
+
+    def render_panel(self, rows, w):
+        # redrawn every frame: line redraws above clear to end of row
+        x = max(0, w - DIFF_PANEL_WIDTH)
+        width = w - x - 1
+        entries = self.diff.panel_lines()
+        if len(entries) > rows:
+            entries = entries[:rows - 1] + [f"... {len(entries) - rows + 1} more"]
+        for rr in range(rows):
+            entry = entries[rr] if rr < len(entries) else ""
+            try:
+                self.stdscr.addstr(rr, x, ("|" + entry)[:width].ljust(width))
+            except curses.error:
+                pass
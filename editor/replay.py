@@ -0,0 +1,347 @@
+# editor/replay.py
+import csv
+import curses
+import hashlib
+import logging
+import os
+import statistics
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from editor.buffer import TextBuffer
+from editor.diff import DiffTracker
+from editor.file_manager import FileManager
+from editor.input_handler import InputHandler, CTRL_S, CTRL_O, CTRL_Q, CTRL_D
+from editor.render import Renderer
+from editor.rope_tree import RopeNode
+from editor.session import RESIZE, OPEN, SAVE_AS, blob_dir, read_session
+
+logger = logging.getLogger(__name__)
+
+
+class FakeScreen:
+    """Minimal stand-in for a curses window: accepts drawing calls, draws nothing."""
+
+    def __init__(self, rows: int = 24, cols: int = 80):
+        self.rows = rows
+        self.cols = cols
+        self.answers = deque()  # queued prompt answers (open / save as)
+
+    def getmaxyx(self):
+        return self.rows, self.cols
+
+    def resize(self, rows: int, cols: int) -> None:
+        self.rows, self.cols = rows, cols
+
+    def move(self, y, x):
+        if not (0 <= y < self.rows and 0 <= x < self.cols):
+            raise curses.error("move out of window")
+
+    def addstr(self, y, x, s):
+        self.move(y, x)
+
+    def clrtoeol(self):
+        pass
+
+    def erase(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def refresh(self):
+        pass
+
+
+class ReplayError(Exception):
+    """The recording cannot be replayed faithfully."""
+
+
+class ReplayFileManager(FileManager):
+    """
+    Answers prompts from the recording; opens load the recorded copy of the
+    file and saves never write to disk.
+    """
+
+    def __init__(self, buffer, blobs=None):
+        super().__init__(buffer)
+        self.blobs = blobs
+        self.digests = deque()  # sha256 of each queued open, in order
+
+    def prompt(self, stdscr, message):
+        return stdscr.answers.popleft() if stdscr.answers else ""
+
+    def load(self, path):
+        digest = self.digests.popleft()
+        blob = os.path.join(self.blobs or "", digest)
+        if not self.blobs or not os.path.exists(blob):
+            raise ReplayError(f"recorded contents of {path} not found (expected {blob})")
+        with open(blob, "rb") as f:
+            if hashlib.sha256(f.read()).hexdigest() != digest:
+                raise ReplayError(f"recorded contents of {path} do not match their hash ({blob})")
+        self.buffer.load_file(blob)
+
+    def write(self, path):
+        self.buffer.mark_saved()
+        logger.info("Replay: save of %s not written", path)
+
+
+@dataclass
+class Sample:
+    index: int                      # event index in the recording
+    t: float                        # recorded seconds since session start
+    op: str
+    handle_ms: float                # InputHandler.handle_key
+    frame_ms: float                 # Renderer.render
+    rope_depth: Optional[int] = None    # deepest line rope (sampled)
+    undo_bytes: Optional[int] = None    # memory held by undo/redo (sampled)
+
+
+def op_name(key: int) -> str:
+    if key in (27, CTRL_Q, 3):
+        return "exit"
+    if key in (10, 13):
+        return "enter"
+    if key in (curses.KEY_BACKSPACE, 127):
+        return "backspace"
+    if key in (curses.KEY_LEFT, curses.KEY_RIGHT, curses.KEY_UP, curses.KEY_DOWN):
+        return "move"
+    if key == 21:
+        return "undo"
+    if key == 18:
+        return "redo"
+    if key == CTRL_S:
+        return "save"
+    if key in (CTRL_O, curses.KEY_F2):
+        return "open"
+    if key == CTRL_D:
+        return "diff_panel"
+    if 32 <= key <= 126:
+        return "insert"
+    return "other"
+
+
+def rope_depth(node) -> int:
+    depth = 0
+    stack = [(node, 1)]
+    while stack:
+        node, d = stack.pop()
+        if node is None:
+            continue
+        depth = max(depth, d)
+        if not node.is_leaf():
+            stack.append((node.left, d + 1))
+            stack.append((node.right, d + 1))
+    return depth
+
+
+# per-node overhead; measured once since instance dict sizes vary with history
+_NODE_BYTES = sys.getsizeof(RopeNode()) + sys.getsizeof(RopeNode().__dict__)
+
+
+class UndoMeter:
+    """
+    Memory held by undo/redo: the snapshot root lists plus every rope node
+    reachable from them (nodes shared with the live text included).
+    Per-node reference counts keep it incremental: a measurement only walks
+    snapshots pushed or dropped since the previous one.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self._snapshots: Dict[int, list] = {}  # id(root list) -> root list
+        self._refs: Dict[int, list] = {}       # id(node) -> [node, count, bytes]
+
+    def measure(self, buffer) -> int:
+        lists = {id(nodes): nodes for nodes, _, _ in buffer.undo_stack}
+        lists.update((id(nodes), nodes) for nodes, _, _ in buffer.redo_stack)
+        for key in [k for k in self._snapshots if k not in lists]:
+            self._release(self._snapshots.pop(key))
+        for key, nodes in lists.items():
+            if key not in self._snapshots:
+                self._snapshots[key] = nodes
+                self._retain(nodes)
+        return self.total
+
+    def _retain(self, nodes) -> None:
+        self.total += sys.getsizeof(nodes)
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            entry = self._refs.get(id(node))
+            if entry:
+                entry[1] += 1
+                continue
+            size = _NODE_BYTES
+            if node.is_leaf():
+                size += sys.getsizeof(node.data)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+            self._refs[id(node)] = [node, 1, size]
+            self.total += size
+
+    def _release(self, nodes) -> None:
+        self.total -= sys.getsizeof(nodes)
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            entry = self._refs[id(node)]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._refs[id(node)]
+                self.total -= entry[2]
+                if not node.is_leaf():
+                    stack.append(node.left)
+                    stack.append(node.right)
+
+
+class SessionReplayer:
+    """
+    Feeds a recorded session through InputHandler, TextBuffer and Renderer on a
+    FakeScreen, timing each operation. speed=None replays at full speed,
+    speed=1.0 in real time (2.0 twice as fast, ...).
+    """
+
+    def __init__(self, events, speed: Optional[float] = None, sample_every: int = 100,
+                 blobs: Optional[str] = None):
+        self.events = events
+        self.speed = speed
+        self.sample_every = max(1, sample_every)
+
+        self.screen = FakeScreen()
+        self.buffer = TextBuffer()
+        self.diff = DiffTracker(self.buffer)
+        self.handler = InputHandler(self.buffer)
+        self.handler.file_manager = ReplayFileManager(self.buffer, blobs)
+        self.handler.diff_tracker = self.diff
+        self.renderer = None
+        self.samples: List[Sample] = []
+        self.undo_meter = UndoMeter()
+        self.overhead = 0.0  # seconds spent sampling, left out of pacing
+
+    def run(self) -> List[Sample]:
+        start = time.monotonic()
+        for i, (t, kind, value) in enumerate(self.events):
+            if self.speed:
+                delay = t / self.speed - (time.monotonic() - start - self.overhead)
+                if delay > 0:
+                    time.sleep(delay)
+
+            if kind in (OPEN, SAVE_AS):
+                continue  # consumed as the prompt answer of the preceding key
+
+            if kind == RESIZE:
+                self.screen.resize(*value)
+                if self.renderer is None:
+                    self.renderer = Renderer(self.screen, self.buffer, self.diff)
+                self._step(i, t, "resize", None)
+                continue
+
+            if self.renderer is None:
+                self.renderer = Renderer(self.screen, self.buffer, self.diff)
+            if i + 1 < len(self.events):
+                _, next_kind, next_value = self.events[i + 1]
+                if next_kind == OPEN:
+                    path, digest = next_value
+                    self.screen.answers.append(path)
+                    self.handler.file_manager.digests.append(digest)
+                elif next_kind == SAVE_AS:
+                    self.screen.answers.append(next_value)
+            if not self._step(i, t, op_name(value), value):
+                break
+        logger.info("Replayed %d events", len(self.samples))
+        return self.samples
+
+    def _step(self, index, t, op, key) -> bool:
+        running = True
+        t0 = time.perf_counter()
+        if key is not None:
+            try:
+                running = self.handler.handle_key(key, self.screen) is not False
+            except KeyboardInterrupt:
+                running = False
+        t1 = time.perf_counter()
+        if running:
+            self.renderer.render()
+        t2 = time.perf_counter()
+
+        sample = Sample(index, t, op, (t1 - t0) * 1000, (t2 - t1) * 1000)
+        if len(self.samples) % self.sample_every == 0:
+            sample.rope_depth = max(rope_depth(line.root) for line in self.buffer.text)
+            sample.undo_bytes = self.undo_meter.measure(self.buffer)
+            self.overhead += time.perf_counter() - t2
+        self.samples.append(sample)
+        return running
+
+
+# ---------------- report -----------------
+def find_growth(points: List[Tuple[Sample, float]], window: int, factor: float = 2.0):
+    """
+    First window whose median reaches factor x the first window's median.
+    Returns (first sample of that window, baseline, peak) or None.
+    """
+    if len(points) < 2 * window:
+        return None
+    medians = [(points[i][0], statistics.median(v for _, v in points[i:i + window]))
+               for i in range(0, len(points) - window + 1, window)]
+    baseline = medians[0][1]
+    peak = max(v for _, v in points)
+    for sample, value in medians[1:]:
+        if value >= factor * max(baseline, 1e-9) and value > baseline:
+            return sample, baseline, peak
+    return None
+
+
+def latency_table(samples: List[Sample]) -> List[str]:
+    by_op: Dict[str, List[float]] = {}
+    for s in samples:
+        by_op.setdefault(s.op, []).append(s.handle_ms + s.frame_ms)
+
+    lines = [f"{'op':<12}{'count':>8}{'mean ms':>10}{'p50':>9}{'p95':>9}{'max':>9}"]
+    for op, values in sorted(by_op.items(), key=lambda kv: -len(kv[1])):
+        values.sort()
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        lines.append(f"{op:<12}{len(values):>8}{statistics.fmean(values):>10.3f}"
+                     f"{values[len(values) // 2]:>9.3f}{p95:>9.3f}{values[-1]:>9.3f}")
+    return lines
+
+
+def growth_report(samples: List[Sample], window: int = 200, factor: float = 2.0) -> List[str]:
+    sampled = [s for s in samples if s.rope_depth is not None]
+    metrics = [
+        ("frame time (ms)", [(s, s.frame_ms) for s in samples], window),
+        ("rope depth", [(s, s.rope_depth) for s in sampled], max(2, window // 40)),
+        ("undo memory (bytes)", [(s, s.undo_bytes) for s in sampled], max(2, window // 40)),
+    ]
+    lines = []
+    for name, points, win in metrics:
+        found = find_growth(points, win, factor)
+        if found is None:
+            lines.append(f"{name}: no growth detected")
+            continue
+        sample, baseline, peak = found
+        lines.append(f"{name}: grew past {factor:g}x baseline at event {sample.index} "
+                     f"(t={sample.t:.1f}s, op={sample.op}); baseline={baseline:g} peak={peak:g}")
+    return lines
+
+
+def write_timeline(samples: List[Sample], path: str) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["index", "t", "op", "handle_ms", "frame_ms", "rope_depth", "undo_bytes"])
+        for s in samples:
+            writer.writerow([s.index, f"{s.t:.3f}", s.op, f"{s.handle_ms:.4f}", f"{s.frame_ms:.4f}",
+                             "" if s.rope_depth is None else s.rope_depth,
+                             "" if s.undo_bytes is None else s.undo_bytes])
+
+
+def replay_file(path: str, speed: Optional[float] = None, sample_every: int = 100) -> List[Sample]:
+    return SessionReplayer(read_session(path), speed, sample_every, blob_dir(path)).run()
@@ -169,6 +169,8 @@ class Rope:
 
     # ---------- rebalance ----------
     def rebalance(self):
+        if self.root.is_leaf():
+            return self  # nothing to balance; keep the node shared with old versions
         leaves = []
         self._collect_leaves(self.root, leaves)
         if len(leaves) <= 1:
@@ -0,0 +1,106 @@
+# editor/session.py
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SESSION_HEADER = "# text-editor session v2"
+
+# event kinds
+KEY = "k"      # payload: key code
+RESIZE = "r"   # payload: rows cols
+OPEN = "o"     # payload: sha256 of the contents, JSON-quoted absolute path
+SAVE_AS = "s"  # payload: JSON-quoted absolute path
+
+
+class SessionRecorder:
+    """
+    Writes a compact, line-based trace of an editing session:
+        <ms since previous event> <kind> <payload>
+    Delta timestamps keep hour-long sessions small; replay with editor.replay.
+    Opened files are copied into blob_dir(path) under their sha256, so a
+    replay sees exactly what was loaded, on any machine.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.blobs = blob_dir(path)
+        # line-buffered: a killed editor still leaves every event up to the kill
+        self.file = open(path, "w", encoding="utf-8", buffering=1)
+        self.file.write(SESSION_HEADER + "\n")
+        self.last_time = time.monotonic()
+        self.size = None
+        logger.info("Recording session to %s", path)
+
+    def _write(self, kind: str, payload: str) -> None:
+        now = time.monotonic()
+        delta_ms = int(round((now - self.last_time) * 1000))
+        self.last_time += delta_ms / 1000  # no drift from rounding
+        self.file.write(f"{delta_ms} {kind} {payload}\n")
+
+    def key(self, key: int) -> None:
+        self._write(KEY, str(key))
+
+    def screen_size(self, rows: int, cols: int) -> None:
+        """Record terminal size; only changes are written."""
+        if (rows, cols) != self.size:
+            self.size = (rows, cols)
+            self._write(RESIZE, f"{rows} {cols}")
+
+    def file_open(self, path: str) -> None:
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        blob = os.path.join(self.blobs, digest)
+        if not os.path.exists(blob):
+            os.makedirs(self.blobs, exist_ok=True)
+            with open(blob, "wb") as f:
+                f.write(data)
+        self._write(OPEN, f"{digest} {json.dumps(os.path.abspath(path))}")
+
+    def file_save_as(self, path: str) -> None:
+        self._write(SAVE_AS, json.dumps(os.path.abspath(path)))
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.file.close()
+            logger.info("Session recording closed: %s", self.path)
+
+
+def blob_dir(path: str) -> str:
+    """Directory holding the opened-file contents of a recording."""
+    return path + ".files"
+
+
+def read_session(path: str) -> List[Tuple[float, str, object]]:
+    """Parse a recording into (seconds since start, kind, payload) tuples."""
+    events = []
+    t = 0.0
+    with open(path, "r", encoding="utf-8") as f:
+        header = f.readline().rstrip("\n")
+        if header != SESSION_HEADER:
+            raise ValueError(f"{path}: not a session recording")
+        for lineno, line in enumerate(f, start=2):
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            delta, kind, payload = line.split(" ", 2)
+            t += int(delta) / 1000
+            if kind == KEY:
+                value: object = int(payload)
+            elif kind == RESIZE:
+                rows, cols = payload.split()
+                value = (int(rows), int(cols))
+            elif kind == OPEN:
+                digest, quoted = payload.split(" ", 1)
+                value = (json.loads(quoted), digest)
+            elif kind == SAVE_AS:
+                value = json.loads(payload)
+            else:
+                raise ValueError(f"{path}:{lineno}: unknown event kind {kind!r}")
+            events.append((t, kind, value))
+    return events
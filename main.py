@@ -1,26 +1,36 @@
+import argparse
 import curses
 import logging
 from editor.buffer import TextBuffer
 from editor.render import Renderer
 from editor.input_handler import InputHandler
 from editor.file_manager import FileManager
+from editor.diff import DiffTracker
+from editor.session import SessionRecorder
 
 logging.basicConfig(filename="editor.log", level=logging.INFO, format="%(asctime)s - %(message)s")
 
-def main(stdscr):
+def main(stdscr, recorder=None):
     curses.curs_set(1)
     stdscr.clear()
     stdscr.refresh()
 
     buffer = TextBuffer()
-    renderer = Renderer(stdscr, buffer)
+    diff = DiffTracker(buffer)
+    renderer = Renderer(stdscr, buffer, diff)
     handler = InputHandler(buffer)
     handler.file_manager = FileManager(buffer)
+    handler.file_manager.recorder = recorder
+    handler.diff_tracker = diff
 
     while True:
         try:
+            if recorder:
+                recorder.screen_size(*stdscr.getmaxyx())
             renderer.render()
             key = stdscr.getch()
+            if recorder:
+                recorder.key(key)
             if key == 27:  # ESC
                 break
             handler.handle_key(key, stdscr)
@@ -28,4 +38,13 @@ def main(stdscr):
             break
 
 if __name__ == "__main__":
-    curses.wrapper(main)
+    parser = argparse.ArgumentParser(description="Terminal text editor")
+    parser.add_argument("--record", metavar="PATH", help="record keys, resizes and file opens/saves for replay.py")
+    args = parser.parse_args()
+
+    recorder = SessionRecorder(args.record) if args.record else None
+    try:
+        curses.wrapper(main, recorder)
+    finally:
+        if recorder:
+            recorder.close()
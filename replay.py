@@ -0,0 +1,29 @@
+import argparse
+import logging
+import sys
+from editor.replay import ReplayError, replay_file, latency_table, growth_report, write_timeline
+
+logging.basicConfig(filename="replay.log", level=logging.INFO, format="%(asctime)s - %(message)s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded session headlessly and report latency")
+    parser.add_argument("session", help="file written by main.py --record")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="pace replay (1.0 = real time); default is full speed")
+    parser.add_argument("--sample-every", type=int, default=100,
+                        help="measure rope depth / undo memory every N events")
+    parser.add_argument("--window", type=int, default=200, help="events per window for growth detection")
+    parser.add_argument("--timeline", metavar="CSV", help="write the per-event latency timeline")
+    args = parser.parse_args()
+
+    try:
+        samples = replay_file(args.session, args.speed, args.sample_every)
+    except (ReplayError, ValueError) as e:
+        sys.exit(f"replay: {e}")
+    print(f"{len(samples)} events replayed\n")
+    print("\n".join(latency_table(samples)))
+    print()
+    print("\n".join(growth_report(samples, args.window)))
+    if args.timeline:
+        write_timeline(samples, args.timeline)
+        print(f"\ntimeline written to {args.timeline}")
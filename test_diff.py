@@ -0,0 +1,91 @@
+import os
+import random
+import tempfile
+
+from editor.buffer import TextBuffer
+from editor.diff import DiffTracker, myers_hunks, chunked
+from editor.rope_tree import Rope
+
+
+def apply_hunks(base, current, hunks):
+    """Rebuild current from base + hunks (hunks must be ordered and disjoint)."""
+    out, i = [], 0
+    for h in hunks:
+        assert h.base_start >= i
+        out += base[i:h.base_start]
+        out += current[h.cur_start:h.cur_start + h.cur_count]
+        i = h.base_start + h.base_count
+    return out + base[i:]
+
+
+def test_myers_round_trip():
+    rng = random.Random(1)
+    for _ in range(500):
+        a = [rng.choice("abc") for _ in range(rng.randint(0, 15))]
+        b = [rng.choice("abc") for _ in range(rng.randint(0, 15))]
+        hunks = myers_hunks(a, b)
+        assert apply_hunks(a, b, hunks) == b
+        assert apply_hunks(a, b, chunked(hunks, 2)) == b
+
+
+def test_myers_gives_up_on_large_distance():
+    a = [f"line {i}" for i in range(1000)]
+    b = ["#" + line for line in a]
+    hunks = myers_hunks(a, b, max_d=10)
+    assert len(hunks) == 1 and apply_hunks(a, b, hunks) == b
+
+
+def test_tracker_load_edit_undo_save():
+    path = os.path.join(tempfile.mkdtemp(), "doc.txt")
+    with open(path, "w") as f:
+        f.write("\n".join(f"line {i}" for i in range(50)))
+
+    buf = TextBuffer()
+    buf.load_file(path)
+    diff = DiffTracker(buf)
+
+    def check():
+        diff.update()
+        base = [Rope(node).get_text() for node in buf.disk_roots]
+        assert apply_hunks(base, buf.get_text_lines(), diff.hunks) == buf.get_text_lines()
+
+    check()
+    assert diff.hunks == []
+
+    rng = random.Random(2)
+    for _ in range(200):
+        buf.cursor.set_position(rng.randrange(len(buf.text)), rng.randint(0, 6))
+        buf.clamp_cursor()
+        op = rng.random()
+        if op < 0.4:
+            buf.save_state()
+            buf.insert_char("x")
+        elif op < 0.6:
+            buf.save_state()
+            buf.backspace_at_cursor()
+        elif op < 0.75:
+            buf.save_state()
+            buf.split_line_at_cursor()
+        elif op < 0.9:
+            buf.undo()
+        else:
+            buf.redo()
+        check()
+
+    while buf.undo_stack:
+        buf.undo()
+    check()
+    assert diff.hunks == []
+
+    buf.save_state()
+    buf.insert_char("y")
+    buf.save_file(path)
+    check()
+    assert diff.hunks == []
+
+
+if __name__ == "__main__":
+    test_myers_round_trip()
+    test_myers_gives_up_on_large_distance()
+    test_tracker_load_edit_undo_save()
+    print("diff tests passed")
@@ -0,0 +1,100 @@
+import os
+import random
+import shutil
+import tempfile
+
+from editor.buffer import TextBuffer
+from editor.input_handler import CTRL_O, CTRL_S
+from editor.replay import ReplayError, SessionReplayer, UndoMeter, replay_file
+from editor.session import KEY, OPEN, RESIZE, SAVE_AS, SessionRecorder, blob_dir, read_session
+
+
+def record_session(tmp):
+    """resize, type "hi", save as out.txt, open doc.txt, type "x", ESC."""
+    doc = os.path.join(tmp, "doc.txt")
+    with open(doc, "w") as f:
+        f.write("first\nsecond")
+
+    path = os.path.join(tmp, "s.rec")
+    rec = SessionRecorder(path)
+    rec.screen_size(24, 80)
+    rec.key(ord("h"))
+    rec.key(ord("i"))
+    rec.key(CTRL_S)
+    rec.file_save_as(os.path.join(tmp, "out.txt"))
+    rec.key(CTRL_O)
+    rec.file_open(doc)
+    rec.key(ord("x"))
+    rec.key(27)
+    rec.close()
+    return path, doc
+
+
+def test_read_session_round_trip():
+    tmp = tempfile.mkdtemp()
+    path, doc = record_session(tmp)
+    events = read_session(path)
+
+    assert [(kind, value) for _, kind, value in events if kind != OPEN] == [
+        (RESIZE, (24, 80)), (KEY, ord("h")), (KEY, ord("i")), (KEY, CTRL_S),
+        (SAVE_AS, os.path.join(tmp, "out.txt")), (KEY, CTRL_O), (KEY, ord("x")), (KEY, 27),
+    ]
+    opened, digest = next(value for _, kind, value in events if kind == OPEN)
+    assert opened == os.path.abspath(doc)
+    assert os.path.exists(os.path.join(blob_dir(path), digest))
+    assert all(a[0] <= b[0] for a, b in zip(events, events[1:]))
+
+
+def test_replay_uses_recorded_contents_and_writes_nothing():
+    tmp = tempfile.mkdtemp()
+    path, doc = record_session(tmp)
+    with open(doc, "w") as f:
+        f.write("changed after recording")
+    before = sorted(os.listdir(tmp))
+
+    replayer = SessionReplayer(read_session(path), blobs=blob_dir(path))
+    samples = replayer.run()
+
+    assert replayer.buffer.get_text_lines() == ["xfirst", "second"]
+    assert sorted(os.listdir(tmp)) == before
+    assert [s.op for s in samples] == ["resize", "insert", "insert", "save", "open", "insert", "exit"]
+
+
+def test_replay_without_recorded_contents_fails_clearly():
+    tmp = tempfile.mkdtemp()
+    path, _ = record_session(tmp)
+    shutil.rmtree(blob_dir(path))
+    try:
+        replay_file(path)
+    except ReplayError as e:
+        assert "doc.txt" in str(e)
+    else:
+        raise AssertionError("expected ReplayError")
+
+
+def test_undo_meter_matches_fresh_measurement():
+    rng = random.Random(3)
+    buf = TextBuffer()
+    meter = UndoMeter()
+    for i in range(600):
+        op = rng.random()
+        if op < 0.5:
+            buf.save_state()
+            buf.insert_char("a")
+        elif op < 0.65:
+            buf.save_state()
+            buf.split_line_at_cursor()
+        elif op < 0.85:
+            buf.undo()
+        else:
+            buf.redo()
+        if i % 25 == 0:
+            assert meter.measure(buf) == UndoMeter().measure(buf)
+
+
+if __name__ == "__main__":
+    test_read_session_round_trip()
+    test_replay_uses_recorded_contents_and_writes_nothing()
+    test_replay_without_recorded_contents_fails_clearly()
+    test_undo_meter_matches_fresh_measurement()
+    print("session tests passed")